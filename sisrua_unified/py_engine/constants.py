@@ -2,6 +2,8 @@
 DXF Generation Constants
 Centralized configuration values for DXF generation
 """
+import os
+import sys
 
 # Coordinate System
 EARTH_RADIUS_METERS = 6378137
@@ -102,3 +104,17 @@ TITLE_BLOCK_SUBDIVISIONS = 25
 
 # Logging
 MAX_LOG_MESSAGE_LENGTH = 200
+
+# Persistent caches (elevation samples, osmnx responses). SISRUA_CACHE_DIR overrides;
+# frozen builds use the per-user cache folder, since their module folder is a temporary
+# extraction directory and the install folder may be read-only (e.g. Program Files).
+def _default_cache_dir():
+    if not getattr(sys, 'frozen', False):
+        return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), 'AppData', 'Local')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'sisRUA', 'cache')
+
+CACHE_DIR = os.environ.get('SISRUA_CACHE_DIR') or _default_cache_dir()
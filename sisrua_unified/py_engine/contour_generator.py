@@ -1,15 +1,22 @@
 import numpy as np
-import matplotlib
-matplotlib.use('Agg') # Headless mode
-import matplotlib.pyplot as plt
+from contourpy import contour_generator, LineType
 from shapely.geometry import LineString
 
+MOVETO = 1 # Path code shared by contourpy and matplotlib
+
+def _split_at_moveto(vertices, codes):
+    """Splits a path's (N, 2) vertices into one array per MOVETO-started polyline."""
+    if codes is None:
+        return [vertices]
+    starts = np.flatnonzero(codes == MOVETO)
+    return np.split(vertices, starts[starts > 0])
+
 def generate_contours(grid_points, interval=1.0):
     """
     Generates contour lines from a grid of (x, y, z) points.
     
     Args:
-        grid_points: List of lists of (x, y, z) tuples.
+        grid_points: (rows, cols, 3) array or list of lists of (x, y, z) tuples.
                      Rows are Y-axis (approx), Cols are X-axis.
         interval: Elevation interval for contours.
         
@@ -17,20 +24,9 @@ def generate_contours(grid_points, interval=1.0):
         List of (elevation, [(x,y), (x,y)...]) tuples representing polylines.
     """
     try:
-        # Convert to numpy arrays for matplotlib
-        rows = len(grid_points)
-        cols = len(grid_points[0])
-        
-        X = np.zeros((rows, cols))
-        Y = np.zeros((rows, cols))
-        Z = np.zeros((rows, cols))
-        
-        for r in range(rows):
-            for c in range(cols):
-                x, y, z = grid_points[r][c]
-                X[r, c] = x
-                Y[r, c] = y
-                Z[r, c] = z
+        # Convert to numpy arrays for contourpy (one copy, then strided views)
+        grid = np.asarray(grid_points, dtype=float)
+        X, Y, Z = grid[:, :, 0], grid[:, :, 1], grid[:, :, 2]
                 
         # Determine levels
         min_z = np.min(Z)
@@ -42,45 +38,23 @@ def generate_contours(grid_points, interval=1.0):
             
         levels = np.arange(np.floor(min_z), np.ceil(max_z) + interval, interval)
         
-        # Generate contours using matplotlib
-        # We use a hidden figure to avoid GUI backend issues
-        fig = plt.figure()
-        ax = fig.add_subplot(111)
-        cs = ax.contour(X, Y, Z, levels=levels)
+        # Generate contours with contourpy, the engine behind matplotlib's contour(),
+        # without building a figure. Each level comes back as one vertex array plus codes.
+        generator = contour_generator(X, Y, Z, line_type=LineType.ChunkCombinedCode)
         
         contour_lines = []
         
-        # Extract paths
-        for i, collection in enumerate(cs.collections):
-            level = cs.levels[i]
-            for path in collection.get_paths():
-                vertices = path.vertices
-                codes = path.codes
-                
-                if codes is None:
-                    # Single continuous line
-                    points = [tuple(v) for v in vertices]
-                    if len(points) > 1:
-                        # Append 3D points (x, y, elevation)
-                        points_3d = [(p[0], p[1], float(level)) for p in points]
-                        contour_lines.append(points_3d)
-                else:
-                    # Split by MOVETO codes
-                    current_line = []
-                    for j, code in enumerate(codes):
-                        if code == path.MOVETO:
-                            if len(current_line) > 1:
-                                contour_lines.append(current_line)
-                            current_line = [(vertices[j][0], vertices[j][1], float(level))]
-                        elif code == path.LINETO:
-                            current_line.append((vertices[j][0], vertices[j][1], float(level)))
-                        elif code == path.CLOSEPOLY:
-                            current_line.append((vertices[j][0], vertices[j][1], float(level)))
-                            
-                    if len(current_line) > 1:
-                        contour_lines.append(current_line)
+        # Trace every level in a single C++ call rather than one call per level
+        level_values = levels.tolist()
+        for level, (all_points, all_codes) in zip(level_values, generator.multi_lines(level_values)):
+            for points, codes in zip(all_points, all_codes):
+                if points is None:
+                    continue
+                # Split by MOVETO codes, then emit 3D points (x, y, elevation)
+                for line in _split_at_moveto(points, codes):
+                    if len(line) > 1:
+                        contour_lines.append([(x, y, level) for x, y in line.tolist()])
                         
-        plt.close(fig)
         return contour_lines
 
     except Exception as e:
@@ -5,6 +5,7 @@ import osmnx as ox
 from shapely.geometry import Point
 import numpy as np
 from pyproj import Transformer
+from concurrent.futures import ThreadPoolExecutor
 
 from osmnx_client import fetch_osm_data
 from dxf_generator import DXFGenerator
@@ -48,6 +49,11 @@ class OSMController:
             Logger.info("No architectural features found in radius.", "warning")
             return
 
+        # Terrain only depends on the feature bounds: download it while auditing and drawing
+        elevation_future = None
+        if self.layers_config.get('terrain', False):
+            elevation_future = self._start_elevation_fetch(gdf)
+
         # 3. Spatial GIS Audit (Authoritative Logic)
         Logger.info("Step 2/5: Running spatial audit...", progress=30)
         analysis_gdf = self._run_audit(gdf)
@@ -70,8 +76,8 @@ class OSMController:
         dxf_gen.add_features(gdf) # Features set the offset ONLY if not initialized above
 
         # 6. Terrain & Contours (Optional)
-        if self.layers_config.get('terrain', False):
-            self._process_terrain(gdf, dxf_gen)
+        if elevation_future is not None:
+            self._process_terrain(gdf, dxf_gen, elevation_future)
 
         # 7. Cartographic Elements
         if dxf_gen.bounds is not None:
@@ -112,7 +118,8 @@ class OSMController:
             Logger.error(f"Spatial Audit internal failure: {se}")
             return None
 
-    def _process_terrain(self, gdf, dxf_gen):
+    def _start_elevation_fetch(self, gdf):
+        """Starts the elevation grid download in the background; returns its future."""
         try:
             # AUTHORITATIVE FIX: Convert project-space bounds to Lat/Lon for elevation API
             gdf_4326 = gdf.to_crs(epsg=4326)
@@ -121,34 +128,44 @@ class OSMController:
             
             # Resolution-aware expansion
             margin = 0.0005 # Degrees
-            elev_points, rows, cols = fetch_elevation_grid(north + margin, south - margin, east + margin, west - margin, resolution=100) 
+            executor = ThreadPoolExecutor(max_workers=1)
+            try:
+                return executor.submit(fetch_elevation_grid, north + margin, south - margin, east + margin, west - margin, resolution=100)
+            finally:
+                executor.shutdown(wait=False) # The submitted fetch still runs to completion
+        except Exception as e:
+            Logger.error(f"Terrain submodule failure: {str(e)}")
+            return None
+
+    def _process_terrain(self, gdf, dxf_gen, elevation_future):
+        try:
+            elev_points, rows, cols = elevation_future.result()
             
-            if elev_points:
+            if len(elev_points):
                 Logger.info(f"Reconstructing {rows}x{cols} terrain grid...", progress=60)
                 transformer = Transformer.from_crs("EPSG:4326", gdf.crs, always_xy=True)
                 
-                grid_rows = []
-                current_row = []
-                for lat, lon, z in elev_points:
-                    x, y = transformer.transform(lon, lat)
-                    current_row.append((x, y, z))
-                    if len(current_row) >= cols:
-                        grid_rows.append(current_row)
-                        current_row = []
-                
-                if current_row: grid_rows.append(current_row)
-                dxf_gen.add_terrain_from_grid(grid_rows)
+                samples = np.asarray(elev_points, dtype=float)
+                if samples.shape != (rows * cols, 3):
+                    Logger.error(f"Terrain grid incomplete: {len(samples)} of {rows * cols} samples")
+                    return
+
+                # Project all samples in a single vectorized call (lon/lat order for always_xy)
+                xs, ys = transformer.transform(samples[:, 1], samples[:, 0])
+                # One (rows, cols, 3) array feeds both the mesh and the contours
+                grid = np.column_stack((xs, ys, samples[:, 2])).reshape(rows, cols, 3)
+                dxf_gen.add_terrain_from_grid(grid)
                 
                 # Contours
                 if self.layers_config.get('contours', False):
-                    self._add_contours(grid_rows, dxf_gen)
+                    self._add_contours(grid, dxf_gen)
         except Exception as e:
             Logger.error(f"Terrain submodule failure: {str(e)}")
 
-    def _add_contours(self, grid_rows, dxf_gen):
+    def _add_contours(self, grid, dxf_gen):
         try:
             interval = 1.0 if not self.layers_config.get('high_res_contours') else 0.5
-            contours = generate_contours(grid_rows, interval=interval)
+            contours = generate_contours(grid, interval=interval)
             if contours:
                 dxf_gen.add_contour_lines(contours)
                 Logger.info(f"Integrated {len(contours)} contour lines.")
@@ -184,17 +201,26 @@ class OSMController:
             tags['highway'] = ['street_lamp']
         return tags
 
+    @staticmethod
+    def _has_tag(gdf, col):
+        """Boolean mask of rows carrying a non-empty value for an OSM tag column."""
+        if col not in gdf.columns:
+            return np.zeros(len(gdf), dtype=bool)
+        values = gdf[col]
+        return (values.notna() & values.astype(bool)).to_numpy()
+
     def _send_geojson_preview(self, gdf, analysis_gdf=None):
         if Logger.SKIP_GEOJSON: return
         try:
             preview_gdf = gdf.copy()
             preview_gdf['area'] = preview_gdf.geometry.area
             preview_gdf['length'] = preview_gdf.geometry.length
-            def get_type(row):
-                if row.get('building'): return 'building'
-                if row.get('highway'): return 'highway'
-                return 'other'
-            preview_gdf['feature_type'] = preview_gdf.apply(get_type, axis=1)
+            # Column-wise classification instead of a Python call per row
+            preview_gdf['feature_type'] = np.select(
+                [self._has_tag(preview_gdf, 'building'), self._has_tag(preview_gdf, 'highway')],
+                ['building', 'highway'],
+                default='other'
+            )
             gdf_wgs84 = preview_gdf.to_crs(epsg=4326)
             payload = json.loads(gdf_wgs84.to_json())
             if analysis_gdf is not None and not analysis_gdf.empty:
@@ -2,6 +2,7 @@ import ezdxf
 import os
 import numpy as np
 import pandas as pd
+from shapely import get_coordinates
 from shapely.geometry import Polygon, MultiPolygon, LineString, MultiLineString, Point
 import geopandas as gpd
 import math
@@ -15,6 +16,19 @@ try:
 except (ImportError, ValueError):
     from utils.logger import Logger
 
+# Fixed attributes for entities drawn once per feature. ezdxf copies dxfattribs
+# on every add_* call, so these shared dicts are never mutated.
+_CURB_ATTRIBS = {'layer': 'VIAS_MEIO_FIO', 'color': 251}
+_BUILDING_HATCH_ATTRIBS = {'layer': 'EDIFICACAO_HATCH'}
+_AREA_LABEL_ATTRIBS = {'layer': 'ANNOT_AREA', 'height': 1.5, 'color': 7}
+_LENGTH_LABEL_ATTRIBS = {'layer': 'ANNOT_LENGTH', 'height': 2.0, 'color': 7, 'rotation': 0.0}
+_TELECOM_POLE_ATTRIBS = {'xscale': 0.8, 'yscale': 0.8}
+_CONTOUR_ATTRIBS = {'layer': 'TOPOGRAFIA_CURVAS', 'color': 8}
+
+_FURNITURE_AMENITIES = frozenset({'bench', 'waste_basket', 'bicycle_parking', 'fountain', 'drinking_water'})
+_HV_POWER_TAGS = frozenset({'line', 'tower', 'substation'})
+_VEGETATION_NATURAL_TAGS = frozenset({'tree', 'wood', 'scrub'})
+
 class DXFGenerator:
     def __init__(self, filename):
         self.filename = filename
@@ -25,6 +39,8 @@ class DXFGenerator:
         
         # Setup CAD standards via StyleManager (SRP Refactor)
         DXFStyleManager.setup_all(self.doc)
+        # Layer names are fixed after setup; cache them for the per-geometry check
+        self._layer_names = {layer.dxf.name for layer in self.doc.layers}
         
         self.msp = self.doc.modelspace()
         self.project_info = {} # Store metadata for title block
@@ -57,42 +73,47 @@ class DXFGenerator:
         else:
              self.bounds = [float(v) for v in b]
 
-        for _, row in gdf.iterrows():
-            geom = row.geometry
-            tags = row.drop('geometry')
-            layer = self.determine_layer(tags, row)
+        # One plain tag dict per feature; iterrows would box every row into a Series
+        tag_records = gdf.drop(columns=gdf.geometry.name).to_dict('records')
+        for geom, tags in zip(gdf.geometry, tag_records):
+            layer = self.determine_layer(tags, None)
             
             self._draw_geometry(geom, layer, self.diff_x, self.diff_y, tags)
 
     def determine_layer(self, tags, row):
         """Maps OSM tags to DXF Layers"""
+        # Each tag is looked up once; checks stay in priority order
+        power = tags.get('power')
+        highway = tags.get('highway')
+        natural = tags.get('natural')
+
         # Power Infrastructure
-        if 'power' in tags and not pd.isna(tags['power']):
-            if tags['power'] in ['line', 'tower', 'substation']: # High Voltage usually
+        if power is not None and not pd.isna(power):
+            if power in _HV_POWER_TAGS: # High Voltage usually
                 return 'INFRA_POWER_HV'
             return 'INFRA_POWER_LV' # poles, minor_lines
 
         # Telecom Infrastructure
-        if 'telecom' in tags and not pd.isna(tags['telecom']):
+        telecom = tags.get('telecom')
+        if telecom is not None and not pd.isna(telecom):
             return 'INFRA_TELECOM'
 
         # Street Furniture
-        furniture_amenities = ['bench', 'waste_basket', 'bicycle_parking', 'fountain', 'drinking_water']
-        if ('amenity' in tags and tags['amenity'] in furniture_amenities) or \
-           ('highway' in tags and tags['highway'] == 'street_lamp'):
+        if tags.get('amenity') in _FURNITURE_AMENITIES or highway == 'street_lamp':
             return 'MOBILIARIO_URBANO'
 
-        if 'building' in tags and not pd.isna(tags['building']):
+        building = tags.get('building')
+        if building is not None and not pd.isna(building):
             return 'EDIFICACAO'
-        if 'highway' in tags and not pd.isna(tags['highway']):
+        if highway is not None and not pd.isna(highway):
             return 'VIAS'
-        if 'natural' in tags and tags['natural'] in ['tree', 'wood', 'scrub']:
+        if natural in _VEGETATION_NATURAL_TAGS:
             return 'VEGETACAO'
         if 'amenity' in tags:
             return 'EQUIPAMENTOS'
         if 'leisure' in tags:
              return 'VEGETACAO' # Parks, etc
-        if 'waterway' in tags or 'natural' in tags and tags['natural'] == 'water':
+        if 'waterway' in tags or natural == 'water':
             return 'HIDROGRAFIA'
             
         return '0' # Default layer
@@ -117,6 +138,18 @@ class DXFGenerator:
         except:
             return (0.0, 0.0)
 
+    def _local_points(self, geom, diff_x, diff_y):
+        """Shifts a geometry's 2D coordinates into drawing space in one numpy pass.
+
+        Out-of-range or non-finite points get the same fallback as _safe_p.
+        """
+        xy = get_coordinates(geom) - (diff_x, diff_y)
+        points = xy.tolist()
+        bad = ~(np.abs(xy) <= 1e11).all(axis=1)  # NaN fails the comparison too
+        for i in np.flatnonzero(bad).tolist():
+            points[i] = self._safe_p(points[i])
+        return points
+
     def _validate_points(self, points, min_points=2, is_3d=False):
         """Validate points list for DXF entities to prevent read errors"""
         if not points or len(points) < min_points:
@@ -142,6 +175,16 @@ class DXFGenerator:
             
         return valid_points
 
+    @staticmethod
+    def _deduplicate_epsilon(pts, eps=0.001):
+        """Drops points closer than eps to the previously kept point."""
+        if not pts: return []
+        res = [pts[0]]
+        for p in pts[1:]:
+            if math.dist(p, res[-1]) > eps:
+                res.append(p)
+        return res
+
     def _simplify_line(self, line, tolerance=0.1):
         """Uses shapely's built-in simplification for robust results."""
         return line.simplify(tolerance, preserve_topology=True)
@@ -207,7 +250,7 @@ class DXFGenerator:
             return
 
         # Ensure layer exists in the document, or fallback to '0'
-        if layer not in self.doc.layers:
+        if layer not in self._layer_names:
             layer = '0'
 
         # Draw Labels for Streets
@@ -227,7 +270,7 @@ class DXFGenerator:
                                 dx = p2.x - p1.x
                                 dy = p2.y - p1.y
                                 if abs(dx) > 1e-5 or abs(dy) > 1e-5:
-                                    angle = np.degrees(np.arctan2(dy, dx))
+                                    angle = math.degrees(math.atan2(dy, dx))
                                     # Ensure text is readable (not upside down)
                                     rotation = angle if -90 <= angle <= 90 else angle + 180
                         except Exception:
@@ -283,28 +326,24 @@ class DXFGenerator:
         width = DXFStyleManager.get_street_width(highway)
         
         try:
-            # Shapely 2.0+ uses offset_curve
-            if hasattr(line, 'offset_curve'):
-                 left = line.offset_curve(width, join_style=2)
-                 right = line.offset_curve(-width, join_style=2)
-            else:
-                 left = line.parallel_offset(width, 'left', join_style=2)
-                 right = line.parallel_offset(width, 'right', join_style=2)
+            # shapely>=2.0 is required, so offset_curve is always available
+            left = line.offset_curve(width, join_style=2)
+            right = line.offset_curve(-width, join_style=2)
             
             for side_geom in [left, right]:
                 if side_geom.is_empty: continue
                 
                 if isinstance(side_geom, LineString):
-                    pts = [self._safe_p((p[0] - diff_x, p[1] - diff_y)) for p in side_geom.coords]
+                    pts = self._local_points(side_geom, diff_x, diff_y)
                     pts = self._validate_points(pts, min_points=2)
                     if pts:
-                        self.msp.add_lwpolyline(pts, dxfattribs={'layer': 'VIAS_MEIO_FIO', 'color': 251})
+                        self.msp.add_lwpolyline(pts, dxfattribs=_CURB_ATTRIBS)
                 elif isinstance(side_geom, MultiLineString):
                     for subline in side_geom.geoms:
-                        pts = [self._safe_p((p[0] - diff_x, p[1] - diff_y)) for p in subline.coords]
+                        pts = self._local_points(subline, diff_x, diff_y)
                         pts = self._validate_points(pts, min_points=2)
                         if pts:
-                            self.msp.add_lwpolyline(pts, dxfattribs={'layer': 'VIAS_MEIO_FIO', 'color': 251})
+                            self.msp.add_lwpolyline(pts, dxfattribs=_CURB_ATTRIBS)
         except Exception as e:
             Logger.info(f"Street offset failed: {e}")
 
@@ -341,7 +380,7 @@ class DXFGenerator:
         dxf_attribs = {'layer': layer, 'thickness': thickness}
 
         # Exterior
-        points = [self._safe_p((p[0] - diff_x, p[1] - diff_y)) for p in poly.exterior.coords]
+        points = self._local_points(poly.exterior, diff_x, diff_y)
         points = self._validate_points(points, min_points=3)  # Polygons need at least 3 points
         if not points:
             return  # Skip invalid polygon
@@ -355,11 +394,7 @@ class DXFGenerator:
                     safe_p = (self._safe_v(centroid.x - diff_x), self._safe_v(centroid.y - diff_y))
                     txt = self.msp.add_text(
                         f"{area:.1f} m2",
-                        dxfattribs={
-                            'layer': 'ANNOT_AREA',
-                            'height': 1.5,
-                            'color': 7
-                        }
+                        dxfattribs=_AREA_LABEL_ATTRIBS
                     )
                     txt.dxf.halign = 1
                     txt.dxf.valign = 2
@@ -372,17 +407,9 @@ class DXFGenerator:
             # AutoCAD's hatch engine hates micro-gaps (< 0.001 units)
             # We deduplicate points with a small epsilon
             try:
-                def deduplicate_epsilon(pts, eps=0.001):
-                    if not pts: return []
-                    res = [pts[0]]
-                    for i in range(1, len(pts)):
-                        if math.dist(pts[i], res[-1]) > eps:
-                            res.append(pts[i])
-                    return res
-
-                clean_points = deduplicate_epsilon(points)
+                clean_points = self._deduplicate_epsilon(points)
                 if clean_points and len(clean_points) >= 3:
-                    hatch = self.msp.add_hatch(color=253, dxfattribs={'layer': 'EDIFICACAO_HATCH'})
+                    hatch = self.msp.add_hatch(color=253, dxfattribs=_BUILDING_HATCH_ATTRIBS)
                     hatch.set_pattern_fill('ANSI31', scale=0.5, angle=45.0)
                     hatch.paths.add_polyline_path(clean_points, is_closed=True)
             except Exception as he:
@@ -390,7 +417,7 @@ class DXFGenerator:
 
         # Holes (optional, complex polygons)
         for interior in poly.interiors:
-             points = [self._safe_p((p[0] - diff_x, p[1] - diff_y)) for p in interior.coords]
+             points = self._local_points(interior, diff_x, diff_y)
              points = self._validate_points(points, min_points=3)
              if points:
                  self.msp.add_lwpolyline(points, close=True, dxfattribs=dxf_attribs)
@@ -399,7 +426,7 @@ class DXFGenerator:
         # Temporarily disabled simplification to troubleshoot distortion
         # pts = [self._safe_p((p[0] - diff_x, p[1] - diff_y)) for p in line.coords]
         
-        pts = [self._safe_p((p[0] - diff_x, p[1] - diff_y)) for p in line.coords]
+        pts = self._local_points(line, diff_x, diff_y)
         points = self._validate_points(pts, min_points=2)
         if not points:
             return  # Skip invalid linestring
@@ -415,12 +442,7 @@ class DXFGenerator:
                         safe_mid = (self._safe_v(mid.x - diff_x), self._safe_v(mid.y - diff_y))
                         ltxt = self.msp.add_text(
                             f"{length:.1f}m",
-                            dxfattribs={
-                                'layer': 'ANNOT_LENGTH',
-                                'height': 2.0,
-                                'color': 7,
-                                'rotation': 0.0
-                            }
+                            dxfattribs=_LENGTH_LABEL_ATTRIBS
                         )
                         ltxt.dxf.halign = 1
                         ltxt.dxf.valign = 2
@@ -475,7 +497,7 @@ class DXFGenerator:
              else:
                  self.msp.add_blockref('POSTE', (x, y)).add_auto_attribs(attribs)
         elif layer == 'INFRA_TELECOM':
-             self.msp.add_blockref('POSTE', (x, y), dxfattribs={'xscale': 0.8, 'yscale': 0.8}).add_auto_attribs(attribs)
+             self.msp.add_blockref('POSTE', (x, y), dxfattribs=_TELECOM_POLE_ATTRIBS).add_auto_attribs(attribs)
         else:
              self.msp.add_circle((x, y), radius=0.5, dxfattribs={'layer': layer})
 
@@ -483,28 +505,26 @@ class DXFGenerator:
         """
         grid_rows: List of rows, where each row is a list of (x, y, z) tuples.
         """
-        if not grid_rows or not grid_rows[0]:
+        try:
+            grid = np.asarray(grid_rows, dtype=float)
+        except (TypeError, ValueError) as e:
+            Logger.info(f"Terrain grid rejected: {e}")
             return
-            
-        rows = len(grid_rows)
-        cols = len(grid_rows[0])
-        
+
         # Ensure dimensions are valid for polymesh (min 2x2)
-        if rows < 2 or cols < 2:
+        if grid.ndim != 3 or grid.shape[0] < 2 or grid.shape[1] < 2 or grid.shape[2] < 3:
             return
+        rows, cols = grid.shape[:2]
+
+        # Apply AUTHORITATIVE OFFSET to every vertex at once on a flat, contiguous
+        # array; invalid values collapse to 0.0 exactly like _safe_v.
+        verts = grid[:, :, :3].reshape(rows * cols, 3) - (self.diff_x, self.diff_y, 0.0)
+        verts[~(np.isfinite(verts) & (np.abs(verts) <= 1e11))] = 0.0
 
         mesh = self.msp.add_polymesh(size=(rows, cols), dxfattribs={'layer': 'TERRENO', 'color': 252})
-        
-        for r, row in enumerate(grid_rows):
-            for c, p in enumerate(row):
-                try:
-                    # Apply AUTHORITATIVE OFFSET with absolute safety
-                    x = self._safe_v(float(p[0]) - self.diff_x)
-                    y = self._safe_v(float(p[1]) - self.diff_y)
-                    z = self._safe_v(float(p[2]))
-                    mesh.set_mesh_vertex((r, c), (x, y, z))
-                except:
-                    mesh.set_mesh_vertex((r, c), (0.0, 0.0, 0.0))
+        # Polymesh vertices are stored row-major, matching the flattened grid
+        for vertex, location in zip(mesh.vertices, verts.tolist()):
+            vertex.dxf.location = location
 
     def add_contour_lines(self, contour_lines):
         """
@@ -523,7 +543,7 @@ class DXFGenerator:
              if valid_line:
                  self.msp.add_polyline3d(
                      valid_line, 
-                     dxfattribs={'layer': 'TOPOGRAFIA_CURVAS', 'color': 8}
+                     dxfattribs=_CONTOUR_ATTRIBS
                  )
 
     def add_cartographic_elements(self, min_x, min_y, max_x, max_y, diff_x, diff_y):
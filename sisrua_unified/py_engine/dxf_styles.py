@@ -1,6 +1,26 @@
+import bisect
 import ezdxf
 from ezdxf.enums import TextEntityAlignment
 
+# Standard CAD lineweights (hundredths of mm) accepted by AutoCAD, ascending.
+# Anything heavier than the last entry is clamped to 53.
+STANDARD_LINEWEIGHTS = (5, 9, 13, 15, 18, 20, 25, 30, 35, 40, 50)
+
+# Authoritative street half-widths (m) by OSM highway tag, looked up once per street.
+STREET_HALF_WIDTHS = {
+    'motorway': 10.0,
+    'trunk': 9.0,
+    'primary': 7.0,
+    'secondary': 6.0,
+    'tertiary': 5.0,
+    'residential': 4.0,
+    'service': 3.0,
+    'living_street': 3.0,
+    'pedestrian': 3.0,
+    'track': 3.0
+}
+DEFAULT_STREET_HALF_WIDTH = 5.0
+
 class DXFStyleManager:
     """Manages CAD layers, blocks, and styles to decouple logic from DXFGenerator."""
     
@@ -51,30 +71,21 @@ class DXFStyleManager:
             ('QUADRO', 7, 0.50), # Border
         ]
         
-        # Standard CAD lineweights mapped (mm to internal int)
-        # AutoCAD only accepts: 0, 5, 9, 13, 15, 18, 20, 25, 30, 35, 40, 50...
-        def map_weight(w):
-            val = int(w * 100)
-            if val <= 5: return 5
-            if val <= 9: return 9
-            if val <= 13: return 13
-            if val <= 15: return 15
-            if val <= 18: return 18
-            if val <= 20: return 20
-            if val <= 25: return 25
-            if val <= 30: return 30
-            if val <= 35: return 35
-            if val <= 40: return 40
-            if val <= 50: return 50
-            return 53
-
+        # Snapshot existing names once instead of probing the layer table per entry
+        existing = {layer.dxf.name.lower() for layer in doc.layers}
         for name, color, lineweight in layers:
-            if name not in doc.layers:
+            if name.lower() not in existing:
                 doc.layers.new(name, dxfattribs={
                     'color': color,
-                    'lineweight': map_weight(lineweight)
+                    'lineweight': DXFStyleManager.map_lineweight(lineweight)
                 })
 
+    @staticmethod
+    def map_lineweight(width_mm):
+        """Snaps a width in mm to the next standard CAD lineweight (single bisect)."""
+        idx = bisect.bisect_left(STANDARD_LINEWEIGHTS, int(width_mm * 100))
+        return STANDARD_LINEWEIGHTS[idx] if idx < len(STANDARD_LINEWEIGHTS) else 53
+
     @staticmethod
     def setup_blocks(doc):
         """Define standard engineering blocks/symbols."""
@@ -149,17 +160,4 @@ class DXFStyleManager:
     @staticmethod
     def get_street_width(highway_tag):
         """Returns the authoritative half-width for a given highway type."""
-        # Cleaned up and centralized for geometric accuracy
-        widths = {
-            'motorway': 10.0,
-            'trunk': 9.0,
-            'primary': 7.0,
-            'secondary': 6.0,
-            'tertiary': 5.0,
-            'residential': 4.0,
-            'service': 3.0,
-            'living_street': 3.0,
-            'pedestrian': 3.0,
-            'track': 3.0
-        }
-        return widths.get(highway_tag, 5.0)
+        return STREET_HALF_WIDTHS.get(highway_tag, DEFAULT_STREET_HALF_WIDTH)
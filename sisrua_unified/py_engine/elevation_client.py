@@ -1,15 +1,117 @@
+import os
+import sqlite3
+import threading
+import time
 import requests
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from utils.logger import Logger
+from constants import CACHE_DIR
 
-BATCH_SIZE = 100 # Open-Elevation limit is often around 100-150 locations per request
+try:
+    # Batches are numeric-heavy JSON; orjson encodes and parses them several times faster
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:
+    import json
+    from json import loads as _json_loads
+
+    def _json_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
+BATCH_SIZE = 500 # POST /lookup takes the points in the body, so batches are not URL-bound
+MAX_WORKERS = 5
+# Circuit breaker: once this many batches fail in a row, the remaining batches
+# fail fast instead of each waiting out its own timeout against a dead service
+MAX_CONSECUTIVE_FAILURES = 3
+OPEN_ELEVATION_URL = "https://api.open-elevation.com/api/v1/lookup"
+
+# Shared keep-alive session: batches reuse pooled TLS connections instead of
+# handshaking per request. Lookups are read-only, so POST is safe to retry.
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=MAX_WORKERS,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.3,
+        backoff_jitter=0.3, # Spread retries so parallel batches do not hit the API in lockstep
+        backoff_max=5.0,
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=frozenset({'POST'}),
+        raise_on_status=False
+    )
+))
+
+# Persistent elevation cache. Keys are lat/lon quantized to 4 decimals (~11 m),
+# finer than the ~30 m SRTM data behind Open-Elevation, so nearby grids reuse samples.
+ELEVATION_CACHE_PATH = os.path.join(CACHE_DIR, 'elevation.sqlite')
+CACHE_SCALE = 10_000
+CACHE_TTL_SECONDS = 30 * 24 * 3600
+
+def _cache_key(lat, lon):
+    return (round(lat * CACHE_SCALE), round(lon * CACHE_SCALE))
+
+def _open_cache():
+    os.makedirs(os.path.dirname(ELEVATION_CACHE_PATH), exist_ok=True)
+    conn = sqlite3.connect(ELEVATION_CACHE_PATH)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS elevation_cache ("
+        "lat_key INTEGER, lng_key INTEGER, elevation REAL, ts INTEGER, "
+        "PRIMARY KEY (lat_key, lng_key))"
+    )
+    return conn
+
+def _cache_get_batch(keys):
+    """Returns {key: elevation} for every requested key that has a fresh cached row."""
+    if not keys:
+        return {}
+    try:
+        conn = _open_cache()
+        try:
+            # Join against the requested keys only; a bounding-box scan would also
+            # pull every neighbouring cell left behind by earlier, shifted grids
+            conn.execute("CREATE TEMP TABLE wanted (lat_key INTEGER, lng_key INTEGER)")
+            conn.executemany("INSERT INTO wanted VALUES (?, ?)", keys)
+            rows = conn.execute(
+                "SELECT c.lat_key, c.lng_key, c.elevation FROM wanted w "
+                "JOIN elevation_cache c ON c.lat_key = w.lat_key AND c.lng_key = w.lng_key "
+                "WHERE c.ts >= ?",
+                (int(time.time()) - CACHE_TTL_SECONDS,)
+            ).fetchall()
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError) as e:
+        Logger.info(f"Elevation cache unavailable: {e}")
+        return {}
+    return {(lat_key, lng_key): elevation for lat_key, lng_key, elevation in rows}
+
+def _cache_set_batch(entries):
+    """Stores (key, elevation) pairs, replacing stale rows and dropping expired ones."""
+    if not entries:
+        return
+    now = int(time.time())
+    try:
+        conn = _open_cache()
+        try:
+            with conn:
+                conn.execute("DELETE FROM elevation_cache WHERE ts < ?", (now - CACHE_TTL_SECONDS,))
+                conn.executemany(
+                    "INSERT OR REPLACE INTO elevation_cache VALUES (?, ?, ?, ?)",
+                    [(key[0], key[1], elevation, now) for key, elevation in entries]
+                )
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError) as e:
+        Logger.info(f"Elevation cache write failed: {e}")
 
 def fetch_elevation_grid(north, south, east, west, resolution=50):
     """
     Generates a grid of points and fetches elevation from Open-Elevation API.
     
     Returns:
-        tuple: (list of (lat, lon, elev), rows, cols)
+        tuple: (ndarray of shape (rows * cols, 3) with lat, lon, elev per row, rows, cols)
     """
     Logger.info("Generating terrain grid...", "info")
     
@@ -28,37 +130,77 @@ def fetch_elevation_grid(north, south, east, west, resolution=50):
     lons = np.linspace(west, east, cols)
     
     # Create grid points
-    locations = []
     # Grid order: for each latitude (row), all longitudes (cols)
-    for lat in lats:
-        for lon in lons:
-            locations.append({'latitude': float(lat), 'longitude': float(lon)})
-            
-    total_points = len(locations)
-    Logger.info(f"Querying elevation for {total_points} points ({rows}x{cols} grid)...")
-    
-    from concurrent.futures import ThreadPoolExecutor
+    lat_grid, lon_grid = np.meshgrid(lats, lons, indexing='ij')
+    total_points = rows * cols
+
+    # One (lat, lon, elevation) row per point; points without a result stay at sea level
+    elevations = np.zeros((total_points, 3))
+    elevations[:, 0] = lat_grid.ravel()
+    elevations[:, 1] = lon_grid.ravel()
+    lat_list = elevations[:, 0].tolist()
+    lon_list = elevations[:, 1].tolist()
+
+    # Serve what we can from the cache; only misses go to the API
+    keys = [_cache_key(lat, lon) for lat, lon in zip(lat_list, lon_list)]
+    cached = _cache_get_batch(keys)
+    missing = []
+    for i, key in enumerate(keys):
+        elevation = cached.get(key)
+        if elevation is None:
+            missing.append(i)
+        else:
+            elevations[i, 2] = elevation
+
+    Logger.info(f"Querying elevation for {len(missing)} of {total_points} points ({rows}x{cols} grid, {total_points - len(missing)} cached)...")
     
+    breaker_lock = threading.Lock()
+    consecutive_failures = 0
+    skipped_batches = 0
+
     def fetch_batch(batch):
+        nonlocal consecutive_failures, skipped_batches
+        with breaker_lock:
+            if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                skipped_batches += 1
+                return None
+
+        result = None
         try:
-            resp = requests.post(
-                "https://api.open-elevation.com/api/v1/lookup",
-                json={"locations": batch},
+            resp = _SESSION.post(
+                OPEN_ELEVATION_URL,
+                data=_json_dumps({"locations": batch}),
                 headers={'Content-Type': 'application/json'},
                 timeout=15
             )
             if resp.status_code == 200:
-                return [(r['latitude'], r['longitude'], r['elevation']) for r in resp.json()['results']]
+                result = [r['elevation'] for r in _json_loads(resp.content)['results']]
+            else:
+                Logger.error(f"Elevation batch failed: HTTP {resp.status_code}")
         except Exception as e:
             Logger.error(f"Elevation batch failed: {e}")
-        return [(loc['latitude'], loc['longitude'], 0) for loc in batch]
 
-    batches = [locations[i:i+BATCH_SIZE] for i in range(0, total_points, BATCH_SIZE)]
-    elevations = []
+        with breaker_lock:
+            consecutive_failures = 0 if result is not None else consecutive_failures + 1
+        return result
+
+    new_entries = []
+
+    # Results come back in batch order; each batch's grid indices place its
+    # samples straight into grid order.
+    batches = [missing[start:start + BATCH_SIZE] for start in range(0, len(missing), BATCH_SIZE)]
+    payloads = [[{'latitude': lat_list[i], 'longitude': lon_list[i]} for i in indices] for indices in batches]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for indices, batch_result in zip(batches, executor.map(fetch_batch, payloads)):
+            if batch_result is None:
+                continue
+            indices = indices[:len(batch_result)]
+            elevations[indices, 2] = batch_result
+            new_entries.extend(zip([keys[i] for i in indices], batch_result))
+
+    if skipped_batches:
+        Logger.error(f"Elevation service unavailable: skipped {skipped_batches} remaining batches")
 
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        results = list(executor.map(fetch_batch, batches))
-        for res in results:
-            elevations.extend(res)
+    _cache_set_batch(new_entries)
                 
     return elevations, rows, cols
@@ -25,6 +25,7 @@ a = Analysis(
         'math',
         'json',
         'sqlite3',
+        'orjson',
         'pyogrio',
         'fiona',
         'rtree',
@@ -2,7 +2,6 @@ import sys
 import argparse
 import json
 import traceback
-from controller import OSMController
 from utils.logger import Logger
 
 def main():
@@ -27,6 +26,10 @@ def main():
     args = parser.parse_args()
     
     try:
+        # Deferred: the controller pulls in osmnx/geopandas/ezdxf, which --help
+        # and argument errors should not have to wait for
+        from controller import OSMController
+
         layers_config = json.loads(args.layers)
         # Default to all true if empty
         if not layers_config:
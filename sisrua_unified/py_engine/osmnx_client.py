@@ -1,12 +1,23 @@
+import os
 import osmnx as ox
 import pandas as pd
 import geopandas as gpd
 try:
     from utils.logger import Logger
-    from constants import MAX_FETCH_RADIUS_METERS
+    from constants import MAX_FETCH_RADIUS_METERS, CACHE_DIR
 except (ImportError, ValueError):
     from .utils.logger import Logger
-    from .constants import MAX_FETCH_RADIUS_METERS
+    from .constants import MAX_FETCH_RADIUS_METERS, CACHE_DIR
+
+# OSM data changes slowly: keep osmnx's Overpass response cache on, in a fixed
+# folder so repeated exports of an area hit it whatever the cwd. osmnx writes
+# cache files without a try, so an unwritable folder must disable the cache.
+ox.settings.cache_folder = os.path.join(CACHE_DIR, 'osmnx')
+try:
+    os.makedirs(ox.settings.cache_folder, exist_ok=True)
+    ox.settings.use_cache = os.access(ox.settings.cache_folder, os.W_OK)
+except OSError:
+    ox.settings.use_cache = False
 
 def fetch_osm_data(lat, lon, radius, tags, crs='auto', polygon=None):
     """
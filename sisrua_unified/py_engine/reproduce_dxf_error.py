@@ -1,6 +1,8 @@
 import os
 import sys
 import math
+import mmap
+import re
 import ezdxf
 from dxf_generator import DXFGenerator
 from utils.logger import Logger
@@ -29,7 +31,7 @@ def stress_test_dxf():
         (0.0, 0.0)
     ]
     try:
-        # This uses the new deduplicate_epsilon internally
+        # This uses _deduplicate_epsilon internally
         gen._draw_polygon({'geometry': type('obj', (), {'exterior': type('obj', (), {'coords': micro_path})(), 'interiors': []}), 'tags': {}})
     except Exception as e:
         Logger.info(f"Hatch stress fail (expected if logic missing): {e}")
@@ -46,16 +48,16 @@ def stress_test_dxf():
     
     Logger.info(f"Generated {output_path}. Starting byte-level scan...")
     
-    # Byte-level scan for illegal values
-    corruption_found = False
+    # Byte-level scan for illegal values: one regex pass over the memory-mapped file
     illegal_terms = [b"nan", b"inf", b"NaN", b"Inf"]
+    illegal_pattern = re.compile(b"|".join(illegal_terms))
     
-    with open(output_path, 'rb') as f:
-        content = f.read()
-        for term in illegal_terms:
-            if term in content:
-                print(f"CRITICAL: Found illegal term '{term.decode()}' in DXF!")
-                corruption_found = True
+    with open(output_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+        found = {m.group() for m in illegal_pattern.finditer(content)}
+    for term in illegal_terms:
+        if term in found:
+            print(f"CRITICAL: Found illegal term '{term.decode()}' in DXF!")
+    corruption_found = bool(found)
                 
     if not corruption_found:
         print("SUCCESS: Byte-scan clean. No NaN/Inf values found.")
@@ -1,4 +1,6 @@
+import numpy as np
 import geopandas as gpd
+import shapely
 from shapely.geometry import Point, LineString
 
 try:
@@ -90,15 +92,17 @@ def _audit_power_line_proximity(power_lines, buildings, crs):
         buffers_gdf['geometry'] = power_lines.geometry.buffer(POWER_LINE_BUFFER_METERS)
         buffers_gdf['analysis_type'] = 'buffer'
         
-        # Check intersections with buildings
-        for idx, building in buildings.iterrows():
-            if buffers_gdf.geometry.intersects(building.geometry).any():
-                violations_count += 1
-                
-                # Get centroid in WGS84 for reporting
-                building_wgs84 = gpd.GeoSeries([building.geometry], crs=crs).to_crs(epsg=4326).iloc[0]
-                centroid = building_wgs84.centroid
-                
+        # Check intersections with buildings: one spatial-index query for all pairs
+        building_pos, _ = buffers_gdf.sindex.query(buildings.geometry, predicate='intersects')
+        violating = buildings.iloc[np.unique(building_pos)]
+        violations_count = len(violating)
+        
+        if violations_count:
+            # Get centroids in WGS84 for reporting (single projection for all violators)
+            buildings_wgs84 = gpd.GeoSeries(violating.geometry.values, crs=crs).to_crs(epsg=4326)
+            centroids = shapely.centroid(buildings_wgs84.to_numpy())
+            
+            for idx, centroid in zip(violating.index, centroids):
                 violations_list.append({
                     "type": "proximity",
                     "description": f"Building {idx} within {POWER_LINE_BUFFER_METERS}m of power line",
@@ -131,7 +135,9 @@ def _calculate_lighting_score(roads, lamps):
     if roads.empty:
         return 0
     
-    total_road_length = roads.geometry.length.sum()
+    # Vectorized GEOS length straight off the geometry array; nansum skips missing
+    # geometries the way the pandas sum did
+    total_road_length = float(np.nansum(shapely.length(roads.geometry.to_numpy())))
     if total_road_length <= 0:
         return 0
     
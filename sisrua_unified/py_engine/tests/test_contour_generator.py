@@ -0,0 +1,36 @@
+import pytest
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contour_generator import generate_contours, _split_at_moveto
+
+def test_split_at_moveto():
+    """Test a multi-part path is split into one polyline per MOVETO."""
+    vertices = np.array([[0, 0], [1, 0], [2, 0], [5, 5], [6, 5], [9, 9]], dtype=float)
+    codes = np.array([1, 2, 2, 1, 2, 1])  # MOVETO = 1, LINETO = 2
+    parts = _split_at_moveto(vertices, codes)
+    assert [p.tolist() for p in parts] == [
+        [[0, 0], [1, 0], [2, 0]],
+        [[5, 5], [6, 5]],
+        [[9, 9]],
+    ]
+
+def test_split_without_codes():
+    """Test a path without codes is a single polyline."""
+    vertices = np.array([[0, 0], [1, 1]], dtype=float)
+    parts = _split_at_moveto(vertices, None)
+    assert len(parts) == 1
+    assert parts[0].tolist() == [[0, 0], [1, 1]]
+
+def test_generate_contours_on_slope():
+    """Test a plane rising 1 m per column yields one straight contour per metre."""
+    xs, ys = np.meshgrid(np.arange(5.0), np.arange(4.0))
+    grid = np.dstack((xs, ys, xs + 100.0))
+    contours = generate_contours(grid, interval=1.0)
+    assert sorted({line[0][2] for line in contours}) == [100.0, 101.0, 102.0, 103.0]
+    for line in contours:
+        assert {round(p[0], 6) for p in line} == {line[0][2] - 100.0}
@@ -0,0 +1,45 @@
+import pytest
+import numpy as np
+import geopandas as gpd
+from shapely.geometry import Point
+from unittest.mock import patch
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from controller import OSMController
+from utils.logger import Logger
+
+def _preview_labels(gdf):
+    """Runs the GeoJSON preview and returns the feature_type of each feature."""
+    controller = OSMController(0, 0, 100, 'out.dxf', {}, 'auto')
+    with patch.object(Logger, 'SKIP_GEOJSON', False), patch.object(Logger, 'geojson') as mock_geojson:
+        controller._send_geojson_preview(gdf)
+    payload = mock_geojson.call_args[0][0]
+    return [f['properties']['feature_type'] for f in payload['features']]
+
+def test_has_tag_ignores_nan_and_empty():
+    gdf = gpd.GeoDataFrame({
+        'geometry': [Point(0, 0), Point(1, 0), Point(2, 0), Point(3, 0)],
+        'building': ['yes', np.nan, '', None]
+    }, crs="EPSG:31983")
+    assert OSMController._has_tag(gdf, 'building').tolist() == [True, False, False, False]
+
+def test_has_tag_missing_column():
+    gdf = gpd.GeoDataFrame({'geometry': [Point(0, 0), Point(1, 0)]}, crs="EPSG:31983")
+    assert OSMController._has_tag(gdf, 'highway').tolist() == [False, False]
+
+def test_preview_labels():
+    """NaN and empty tags no longer count as present; building wins over highway."""
+    gdf = gpd.GeoDataFrame({
+        'geometry': [Point(0, 0), Point(1, 0), Point(2, 0), Point(3, 0), Point(4, 0), Point(5, 0)],
+        'building': ['yes', np.nan, '', np.nan, 'house', np.nan],
+        'highway': [np.nan, 'residential', np.nan, '', 'service', np.nan]
+    }, crs="EPSG:31983")
+    assert _preview_labels(gdf) == ['building', 'highway', 'other', 'other', 'building', 'other']
+
+def test_preview_labels_without_tag_columns():
+    gdf = gpd.GeoDataFrame({'geometry': [Point(0, 0), Point(1, 0)]}, crs="EPSG:31983")
+    assert _preview_labels(gdf) == ['other', 'other']
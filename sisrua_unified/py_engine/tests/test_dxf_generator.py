@@ -89,3 +89,35 @@ def test_legend_and_title_block(dxf_gen):
     layout_text = [e.dxf.text for e in layout if e.dxftype() in ('TEXT', 'MTEXT')]
     assert any("TEST CLIENT" in t for t in layout_text)
     assert any("TEST PROJECT" in t for t in layout_text)
+
+def test_lineweight_mapping():
+    """Test that widths snap up to the next standard CAD lineweight."""
+    from dxf_styles import DXFStyleManager
+    assert DXFStyleManager.map_lineweight(0.05) == 5
+    assert DXFStyleManager.map_lineweight(0.09) == 9
+    assert DXFStyleManager.map_lineweight(0.10) == 13
+    assert DXFStyleManager.map_lineweight(0.30) == 30
+    assert DXFStyleManager.map_lineweight(0.50) == 50
+    assert DXFStyleManager.map_lineweight(0.80) == 53
+
+def test_terrain_grid_sanitized(dxf_gen):
+    """Test terrain mesh applies the offset and zeroes NaN/Inf vertices."""
+    dxf_gen.diff_x, dxf_gen.diff_y = 10.0, 5.0
+    grid = [
+        [(0, 0, 10), (10, 0, float('nan'))],
+        [(0, 10, 12), (10, 10, float('inf'))],
+    ]
+    dxf_gen.add_terrain_from_grid(grid)
+
+    meshes = [e for e in dxf_gen.msp if e.dxftype() == 'POLYLINE']
+    assert len(meshes) == 1
+    mesh = meshes[0]
+    assert tuple(mesh.get_mesh_vertex((0, 0)).dxf.location) == (-10.0, -5.0, 10.0)
+    assert tuple(mesh.get_mesh_vertex((0, 1)).dxf.location) == (0.0, -5.0, 0.0)
+    assert tuple(mesh.get_mesh_vertex((1, 1)).dxf.location) == (0.0, 5.0, 0.0)
+
+def test_local_points_offset_and_guard(dxf_gen):
+    """Test geometry coordinates are shifted and huge values fall back safely."""
+    line = LineString([(100.0, 200.0), (4e12, 205.0), (110.0, 210.0)])
+    pts = dxf_gen._local_points(line, 100.0, 200.0)
+    assert [tuple(p) for p in pts] == [(0.0, 0.0), (0.0, 5.0), (10.0, 10.0)]
@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import patch, MagicMock
 import sys
 import os
+from json import dumps, loads
 
 # Add parent directory to path to import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -9,26 +10,30 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from elevation_client import fetch_elevation_grid
 
 class TestElevation:
-    @patch('requests.post')
+    @pytest.fixture(autouse=True)
+    def isolated_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setattr('elevation_client.ELEVATION_CACHE_PATH', str(tmp_path / 'elevation.sqlite'))
+
+    @patch('elevation_client._SESSION.post')
     def test_fetch_elevation_grid_success(self, mock_post):
         # Mock response
         mock_resp = MagicMock()
         mock_resp.status_code = 200
-        mock_resp.json.return_value = {
+        mock_resp.content = dumps({
             'results': [
                 {'latitude': 10.0, 'longitude': 10.0, 'elevation': 100.0},
                 {'latitude': 10.0, 'longitude': 10.1, 'elevation': 105.0}
             ]
-        }
+        }).encode()
         mock_post.return_value = mock_resp
         
         # Call
         elevations, rows, cols = fetch_elevation_grid(10.1, 10.0, 10.2, 10.0, resolution=10000)
         
-        assert len(elevations) > 0
+        assert elevations.shape == (rows * cols, 3)
         assert elevations[0][2] == 100.0
 
-    @patch('requests.post')
+    @patch('elevation_client._SESSION.post')
     def test_fetch_elevation_grid_failure(self, mock_post):
         # Mock failure
         mock_resp = MagicMock()
@@ -42,3 +47,94 @@ class TestElevation:
         assert len(elevations) > 0
         assert elevations[0][2] == 0
 
+    @patch('elevation_client._SESSION.post')
+    def test_fetch_elevation_grid_uses_cache(self, mock_post):
+        def respond(url, data, **kwargs):
+            resp = MagicMock()
+            resp.status_code = 200
+            resp.content = dumps({'results': [
+                {'latitude': loc['latitude'], 'longitude': loc['longitude'], 'elevation': 42.0}
+                for loc in loads(data)['locations']
+            ]}).encode()
+            return resp
+        mock_post.side_effect = respond
+
+        first, _, _ = fetch_elevation_grid(10.1, 10.0, 10.2, 10.0, resolution=10000)
+        calls = mock_post.call_count
+
+        # Second run must be served entirely from the cache
+        second, _, _ = fetch_elevation_grid(10.1, 10.0, 10.2, 10.0, resolution=10000)
+        assert mock_post.call_count == calls
+        assert [e[2] for e in second] == [e[2] for e in first] == [42.0] * len(first)
+
+    @patch('elevation_client._SESSION.post')
+    def test_failed_batches_are_not_cached(self, mock_post):
+        mock_resp = MagicMock()
+        mock_resp.status_code = 500
+        mock_post.return_value = mock_resp
+
+        fetch_elevation_grid(10.1, 10.0, 10.2, 10.0, resolution=10000)
+        fetch_elevation_grid(10.1, 10.0, 10.2, 10.0, resolution=10000)
+
+        assert mock_post.call_count == 2
+
+    @patch('elevation_client._SESSION.post')
+    def test_circuit_breaker_skips_remaining_batches(self, mock_post):
+        import elevation_client
+        mock_resp = MagicMock()
+        mock_resp.status_code = 503
+        mock_post.return_value = mock_resp
+
+        # ~100x100 grid -> 20 batches of 500 points
+        elevations, rows, cols = fetch_elevation_grid(10.01, 10.0, 10.01, 10.0, resolution=10)
+        batches = -(-rows * cols // elevation_client.BATCH_SIZE)
+
+        assert batches > elevation_client.MAX_WORKERS + elevation_client.MAX_CONSECUTIVE_FAILURES
+        # Only requests already in flight when the breaker opened may still hit the API
+        assert mock_post.call_count < elevation_client.MAX_WORKERS + elevation_client.MAX_CONSECUTIVE_FAILURES
+        assert (elevations[:, 2] == 0).all()
+
+    @patch('elevation_client._SESSION.post')
+    def test_unwritable_cache_falls_back_to_network(self, mock_post, tmp_path, monkeypatch):
+        # A regular file where the cache folder should be: makedirs raises OSError
+        blocker = tmp_path / 'blocker'
+        blocker.write_text('')
+        monkeypatch.setattr('elevation_client.ELEVATION_CACHE_PATH', str(blocker / 'cache' / 'elevation.sqlite'))
+
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        mock_resp.content = dumps({
+            'results': [
+                {'latitude': 10.0, 'longitude': 10.0, 'elevation': 100.0},
+                {'latitude': 10.0, 'longitude': 10.1, 'elevation': 105.0}
+            ]
+        }).encode()
+        mock_post.return_value = mock_resp
+
+        elevations, rows, cols = fetch_elevation_grid(10.1, 10.0, 10.2, 10.0, resolution=10000)
+
+        assert mock_post.called
+        assert elevations[0][2] == 100.0
+
+    def test_cache_lookup_returns_only_requested_keys(self):
+        import elevation_client
+        elevation_client._cache_set_batch([((1, 1), 10.0), ((2, 2), 20.0), ((1, 2), 12.0)])
+
+        # (1, 2) lies inside the bounding box of the request but was not asked for
+        assert elevation_client._cache_get_batch([(1, 1), (2, 2), (3, 3)]) == {(1, 1): 10.0, (2, 2): 20.0}
+
+    def test_cache_write_drops_expired_rows(self, monkeypatch):
+        import elevation_client
+        now = 1_000_000_000
+        monkeypatch.setattr('elevation_client.time.time', lambda: now)
+        elevation_client._cache_set_batch([((1, 1), 10.0)])
+
+        now += elevation_client.CACHE_TTL_SECONDS + 1
+        elevation_client._cache_set_batch([((2, 2), 20.0)])
+
+        conn = elevation_client._open_cache()
+        try:
+            rows = conn.execute("SELECT lat_key, lng_key FROM elevation_cache").fetchall()
+        finally:
+            conn.close()
+        assert rows == [(2, 2)]
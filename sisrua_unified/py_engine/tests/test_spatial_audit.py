@@ -7,7 +7,7 @@ import os
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from spatial_audit import run_spatial_audit
+from spatial_audit import run_spatial_audit, _calculate_lighting_score
 
 def test_spatial_audit_no_data():
     """Test audit with empty GDF."""
@@ -68,6 +68,13 @@ def test_lighting_coverage():
     assert 50 < summary['coverageScore'] < 70
     assert summary['violations'] == 0
 
+def test_lighting_coverage_missing_road_geometry():
+    """A road without geometry must not turn the total length into NaN."""
+    roads = gpd.GeoDataFrame({'geometry': [LineString([(0,0), (100,0)]), None]})
+    lamps = gpd.GeoDataFrame({'geometry': [Point(10, 0), Point(40, 0)]})
+
+    assert 50 < _calculate_lighting_score(roads, lamps) < 70
+
 def test_analysis_layers_output():
     """Test if analysis features are correctly generated."""
     lamp = Point(0,0)
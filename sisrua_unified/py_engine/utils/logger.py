@@ -1,13 +1,25 @@
 import json
 import sys
 
+try:
+    import orjson
+
+    def _dumps(payload):
+        # orjson encodes large GeoJSON previews several times faster than stdlib json
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+        except TypeError:
+            return json.dumps(payload)
+except ImportError:
+    _dumps = json.dumps
+
 class Logger:
     SKIP_GEOJSON = False
     
     @staticmethod
     def debug(message):
         # Debug messages are less critical, just print to stdout without JSON formatting
-        print(json.dumps({"status": "debug", "message": message}))
+        print(_dumps({"status": "debug", "message": message}))
         sys.stdout.flush()
     
     @staticmethod
@@ -15,22 +27,22 @@ class Logger:
         payload = {"status": status, "message": message}
         if progress is not None:
             payload["progress"] = progress
-        print(json.dumps(payload))
+        print(_dumps(payload))
         sys.stdout.flush()
 
     @staticmethod
     def error(message):
-        print(json.dumps({"status": "error", "message": message}))
+        print(_dumps({"status": "error", "message": message}))
         sys.stdout.flush()
 
     @staticmethod
     def success(message):
-        print(json.dumps({"status": "success", "message": message}))
+        print(_dumps({"status": "success", "message": message}))
         sys.stdout.flush()
 
     @staticmethod
     def geojson(data, message="Updating map preview..."):
         if Logger.SKIP_GEOJSON:
             return
-        print(json.dumps({"type": "geojson", "data": data, "message": message}))
+        print(_dumps({"type": "geojson", "data": data, "message": message}))
         sys.stdout.flush()